@@ -1,6 +1,9 @@
 """
 Flask backend API for Clustering Visualization
 Serves clustering models and predictions
+
+Start with `python -m backend.app` from the repository root or
+`python app.py` from backend/
 """
 
 from flask import Flask, request, jsonify
@@ -9,11 +12,15 @@ import pandas as pd
 import numpy as np
 import json
 import os
-from sklearn.preprocessing import StandardScaler
+import sys
 from sklearn.cluster import DBSCAN, AgglomerativeClustering
 from scipy.cluster.hierarchy import linkage, fcluster
 import joblib
 
+# Features come from data.py in the repository root; make it importable however the app is started
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data import load_feature_store
+
 app = Flask(__name__)
 CORS(app)
 
@@ -21,42 +28,6 @@ CORS(app)
 # LOAD PREPROCESSED DATA AND TRAIN MODELS
 # ============================================================================
 
-def preprocess_data():
-    """Load and preprocess the Mall Customers dataset"""
-    # Try multiple paths for the CSV file
-    csv_paths = [
-        'Mall_Customers.csv',
-        '../Mall_Customers.csv',
-        '../../Mall_Customers.csv',
-        os.path.join(os.path.dirname(__file__), '../Mall_Customers.csv')
-    ]
-    
-    csv_file = None
-    for path in csv_paths:
-        if os.path.exists(path):
-            csv_file = path
-            break
-    
-    if csv_file is None:
-        raise FileNotFoundError(f"Mall_Customers.csv not found. Tried: {csv_paths}")
-    
-    df = pd.read_csv(csv_file)
-    df = df.drop(columns=['CustomerID'])
-    
-    # OneHot encode gender
-    from sklearn.preprocessing import OneHotEncoder
-    ohe = OneHotEncoder(drop='first', sparse_output=False)
-    genre_encoded = ohe.fit_transform(df[['Genre']])
-    genre_df = pd.DataFrame(genre_encoded, columns=ohe.get_feature_names_out(['Genre']))
-    df = pd.concat([df.drop(columns=['Genre']), genre_df], axis=1)
-    
-    # Standardize numerical features
-    scaler = StandardScaler()
-    numerical_cols = ['Age', 'Annual Income (k$)', 'Spending Score (1-100)']
-    df[numerical_cols] = scaler.fit_transform(df[numerical_cols])
-    
-    return df, scaler
-
 def train_models(X):
     """Train all three clustering models"""
     models = {}
@@ -78,19 +49,25 @@ def train_models(X):
 # Initialize on startup
 try:
     print("🔄 Loading data...")
-    df_processed, scaler = preprocess_data()
-    print(f"✅ Data loaded: {df_processed.shape}")
+    # Shared with clustering.py; rebuilt by data.py only when the CSV or preprocessing changed
+    store = load_feature_store()
+    print(f"✅ Data loaded: {store.shape} ({store.nbytes} bytes, float32 store)")
     
-    X = df_processed.values
-    print(f"✅ Features: {df_processed.columns.tolist()}")
+    # Zero-copy views over the mapped store
+    X = store.values
+    df_processed = store.to_frame()
+    print(f"✅ Features: {store.columns}")
     
     print("🔄 Training models...")
     models_labels, agg_model, Z_divisive = train_models(X)
     print(f"✅ Models trained successfully")
     
-    # Store feature names and scalers for later use
-    feature_names = df_processed.columns.tolist()
+    # Store feature names and scaler parameters for later use
+    feature_names = list(store.columns)
     n_features = len(feature_names)
+    scaled_idx = [feature_names.index(c) for c in store.extra['scaled_columns']]
+    scaler_mean = np.array(store.extra['scaler_mean'])
+    scaler_scale = np.array(store.extra['scaler_scale'])
     print(f"✅ Backend initialized with {n_features} features")
 except Exception as e:
     print(f"❌ Initialization error: {str(e)}")
@@ -115,9 +92,11 @@ def normalize_input(data_dict):
         
         raw_array = np.array(raw_values).reshape(1, -1)
         
-        # Normalize numerical features
+        # Normalize numerical features with the scaler fitted when the store was built
+        # (match the store's float32 dtype)
         normalized = raw_array.copy()
-        normalized[:, [0, 1, 2]] = scaler.transform(raw_array[:, [0, 1, 2]])
+        normalized[:, scaled_idx] = (raw_array[:, scaled_idx] - scaler_mean) / scaler_scale
+        normalized = normalized.astype(X.dtype)
         
         return normalized, None
     except Exception as e:
@@ -125,8 +104,6 @@ def normalize_input(data_dict):
 
 def get_cluster_profile(cluster_id, algorithm):
     """Get profile of a cluster"""
-    df = df_processed.copy()
-    
     if algorithm == 'dbscan':
         labels = models_labels['dbscan']
     elif algorithm == 'agglomerative':
@@ -134,20 +111,21 @@ def get_cluster_profile(cluster_id, algorithm):
     else:  # divisive
         labels = models_labels['divisive']
     
-    df['cluster'] = labels
-    cluster_data = df[df['cluster'] == cluster_id]
+    # Select rows straight from the shared array instead of copying the frame
+    cluster_data = X[labels == cluster_id]
     
     if len(cluster_data) == 0:
         return None
     
     profile = {
         'size': len(cluster_data),
-        'percentage': round(len(cluster_data) / len(df) * 100, 2),
+        'percentage': round(len(cluster_data) / len(X) * 100, 2),
         'features': {}
     }
     
-    for feature in feature_names:
-        profile['features'][feature] = round(float(cluster_data[feature].mean()), 4)
+    means = cluster_data.mean(axis=0, dtype=np.float64)
+    for j, feature in enumerate(feature_names):
+        profile['features'][feature] = round(float(means[j]), 4)
     
     return profile
 
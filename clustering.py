@@ -3,6 +3,7 @@ import sys
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import pandas as pd
 
 from sklearn.cluster import KMeans, AgglomerativeClustering
 from sklearn.metrics import silhouette_score, calinski_harabasz_score
@@ -16,10 +17,13 @@ except Exception:
 # Global k number for clustering
 K_NUM = 5
 
-# Import processed dataframe from data.py (expects `df` to be defined there)
+# Load processed features from data.py into the memory-mapped float32 store;
+# `df` is a DataFrame view over the mapped array, not a copy
 try:
-    from data import preprocess_data
-    df = preprocess_data()
+    from data import load_feature_store
+    # `python clustering.py --rebuild` forces the store to be rebuilt from the CSV
+    store = load_feature_store(rebuild='--rebuild' in sys.argv)
+    df = store.to_frame()
 except Exception as e:
     print('Failed to import and preprocess data from data.py:', e)
     sys.exit(1)
@@ -93,15 +97,14 @@ def plot_clusters_2d(features, labels, title_prefix='cluster', save_name='cluste
     plt.savefig(path)
 
 def summarize_clusters(features, labels):
-    dfc = features.copy()
-    dfc['Cluster'] = labels
-    summary = dfc.groupby('Cluster').agg(['mean','count'])
+    # Group by the label array directly instead of adding a column to a copy
+    summary = features.groupby(pd.Series(labels, name='Cluster', index=features.index)).agg(['mean','count'])
     print('\nCluster summary (mean and count):')
     print(summary)
 
 def main():
-    # features: use all columns in df (already preprocessed in data.py)
-    features = df.copy()
+    # features: zero-copy float32 view of all columns in the store (preprocessed in data.py)
+    features = store.values
 
     # Run KMeans with range up to K_NUM for elbow plot, but use K_NUM as final k
     print(f'\nRunning KMeans++ (testing k from 2 to {K_NUM} for elbow plot)')
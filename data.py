@@ -1,11 +1,23 @@
+import hashlib
+import json
+import os
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
-def preprocess_data():
-    df = pd.read_csv('Mall_Customers.csv')
+from feature_store import FORMAT_VERSION, FeatureStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_PATH = os.path.join(BASE_DIR, 'Mall_Customers.csv')
+
+# Directory of the memory-mapped feature store (see feature_store.py), shared by
+# clustering.py and the backend; FEATURE_STORE_PATH in the environment overrides it
+FEATURE_STORE_PATH = os.path.join(BASE_DIR, 'feature_store')
+
+NUMERICAL_COLS = ['Age', 'Annual Income (k$)', 'Spending Score (1-100)']
+
+def preprocess_data(return_scaler=False):
+    df = pd.read_csv(CSV_PATH)
     df_original = df.copy()  # Keep original for comparison
 
     # Check for missing values
@@ -43,14 +55,50 @@ def preprocess_data():
 
     # Data preprocessing: Scale numerical features appropriately
     scaler = StandardScaler()
-    numerical_cols = ['Age', 'Annual Income (k$)', 'Spending Score (1-100)']
-    df[numerical_cols] = scaler.fit_transform(df[numerical_cols])
+    df[NUMERICAL_COLS] = scaler.fit_transform(df[NUMERICAL_COLS])
 
+    if return_scaler:
+        return df, scaler
     return df
 
+def _store_fingerprint(encode_binary):
+    # The store is stale if the CSV, anything in this file (preprocess_data, the
+    # column constants, _build_store_frame) or the store format changed. The
+    # constants are hashed by value too, since they can be changed at runtime.
+    h = hashlib.sha256()
+    for path in (CSV_PATH, os.path.abspath(__file__)):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    h.update(json.dumps({
+        'numerical_cols': NUMERICAL_COLS,
+        'encode_binary': bool(encode_binary),
+        'format': FORMAT_VERSION,
+    }).encode('utf-8'))
+    return h.hexdigest()
+
+def _build_store_frame():
+    df, scaler = preprocess_data(return_scaler=True)
+    # Keep the scaler parameters with the data so readers can scale new inputs
+    # without preprocessing again
+    extra = {
+        'scaled_columns': NUMERICAL_COLS,
+        'scaler_mean': scaler.mean_.tolist(),
+        'scaler_scale': scaler.scale_.tolist(),
+    }
+    return df, extra
+
+def load_feature_store(path=None, rebuild=False, encode_binary=False):
+    # Build the store once and reuse it while the CSV and preprocess_data() are
+    # unchanged, so other processes open the same mapped file.
+    # FEATURE_STORE_REBUILD=1 in the environment forces a rebuild.
+    path = path or os.environ.get('FEATURE_STORE_PATH', FEATURE_STORE_PATH)
+    rebuild = rebuild or os.environ.get('FEATURE_STORE_REBUILD') == '1'
+    return FeatureStore.open_or_build(path, _store_fingerprint(encode_binary), _build_store_frame,
+                                      encode_binary=encode_binary, rebuild=rebuild)
+
 if __name__ == '__main__':
     # Load and display original data
-    df_original = pd.read_csv('Mall_Customers.csv')
+    df_original = pd.read_csv(CSV_PATH)
     print("Original Dataset info (Schema):")
     df_original.info()
     print("\nOriginal Dataset head (First 5 rows):")
@@ -0,0 +1,255 @@
+"""
+Memory-mapped float32 feature store.
+
+Keeps the preprocessed features in one file on disk and hands out numpy views
+over it, so clustering code and backend workers read the same pages instead of
+each holding its own float64 DataFrame copy.
+
+Layout of a store directory:
+    CURRENT       name of the published version directory
+    v-*/          one immutable version per build
+        features.npy  float32, C-contiguous (n_samples, n_float_columns)
+        codes.npy     uint8 (n_samples, n_code_columns), only if binary columns are encoded
+        columns.json  column names, block / index of each column, fingerprint, extra metadata
+"""
+
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FLOAT_FILE = 'features.npy'
+CODES_FILE = 'codes.npy'
+META_FILE = 'columns.json'
+CURRENT_FILE = 'CURRENT'
+LOCK_FILE = '.lock'
+VERSION_PREFIX = 'v-'
+
+# Bump when the on-disk layout or columns.json keys change; stores with another
+# format are rebuilt instead of being opened
+FORMAT_VERSION = 1
+
+# OneHot columns that can be stored as small integers instead of float32
+BINARY_COLUMNS = ['Genre_Male']
+
+
+def _write_npy(path, array):
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=array.dtype, shape=array.shape)
+    out[:] = array
+    out.flush()
+    del out
+
+
+def _read_current(path):
+    try:
+        with open(os.path.join(path, CURRENT_FILE), encoding='utf-8') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _read_meta(path, version):
+    try:
+        with open(os.path.join(path, version, META_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+@contextlib.contextmanager
+def _build_lock(path):
+    # Only one process builds at a time; the others wait and then reuse its result.
+    # Without fcntl builds still can't clobber each other, since each one writes
+    # its own version directory, they just may run twice and old versions are
+    # not pruned.
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(path, LOCK_FILE), 'w') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class FeatureStore:
+    """Read-only view over the published version of a feature store directory."""
+
+    def __init__(self, path, version=None):
+        self.path = path
+        if version is not None:
+            self._open(version)
+            return
+        # A builder may prune the version we just read from CURRENT before we
+        # map it; in that case CURRENT already names a newer one, so retry
+        try:
+            self._open(_read_current(path))
+        except FileNotFoundError:
+            self._open(_read_current(path))
+
+    def _open(self, version):
+        if version is None:
+            raise FileNotFoundError(f"No feature store published at {self.path}")
+        # Version directories are never modified once published (they are mapped
+        # read-only), so the arrays and the metadata read here belong to the same build
+        self.version = version
+        self.version_path = os.path.join(self.path, version)
+        with open(os.path.join(self.version_path, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Feature store {self.version_path} has format {meta.get('format')}, "
+                             f"expected {FORMAT_VERSION}")
+        self.columns = meta['columns']
+        self.fingerprint = meta.get('fingerprint')
+        self.extra = meta.get('extra', {})
+        self._layout = {name: (block, idx) for name, block, idx in meta['layout']}
+
+        self._floats = np.load(os.path.join(self.version_path, FLOAT_FILE), mmap_mode='r')
+        self._codes = None
+        if meta['has_codes']:
+            self._codes = np.load(os.path.join(self.version_path, CODES_FILE), mmap_mode='r')
+        n_stored = self._floats.shape[1] + (self._codes.shape[1] if self._codes is not None else 0)
+        if self._floats.shape[0] != meta['n_samples'] or n_stored != len(self.columns):
+            raise ValueError(f"Feature store {self.version_path} does not match its metadata")
+        self._values = None
+
+    @classmethod
+    def from_frame(cls, df, path, encode_binary=False, fingerprint=None, extra=None):
+        """Write `df` as a new version of the store at `path` and return it opened read-only.
+
+        With encode_binary=True the columns in BINARY_COLUMNS are kept as uint8
+        codes. That saves space, but `values` then has to build (once) a float32
+        copy instead of returning a view, so leave it off when the data feeds models.
+
+        Old versions are not removed here; open_or_build() prunes them under the build lock.
+        """
+        os.makedirs(path, exist_ok=True)
+        columns = [str(c) for c in df.columns]
+        code_cols = [c for c in columns if encode_binary and c in BINARY_COLUMNS]
+        float_cols = [c for c in columns if c not in code_cols]
+
+        floats = np.ascontiguousarray(df[float_cols].to_numpy(dtype=np.float32))
+        codes = None
+        if code_cols:
+            raw_codes = df[code_cols].to_numpy()
+            if not np.isin(raw_codes, (0, 1)).all():
+                raise ValueError(f"Columns {code_cols} must only contain 0/1 to be encoded as uint8")
+            codes = np.ascontiguousarray(raw_codes.astype(np.uint8))
+
+        # Each build gets its own directory, so concurrent writers never share a file
+        version_path = tempfile.mkdtemp(prefix=VERSION_PREFIX, dir=path)
+        _write_npy(os.path.join(version_path, FLOAT_FILE), floats)
+        if codes is not None:
+            _write_npy(os.path.join(version_path, CODES_FILE), codes)
+        layout = [[c, 'float', float_cols.index(c)] if c in float_cols else [c, 'code', code_cols.index(c)]
+                  for c in columns]
+        meta = {
+            'format': FORMAT_VERSION,
+            'columns': columns,
+            'layout': layout,
+            'has_codes': codes is not None,
+            'n_samples': len(df),
+            'fingerprint': fingerprint,
+            'extra': extra or {},
+        }
+        with open(os.path.join(version_path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        # Publish by swapping the CURRENT pointer: readers see the old or the new version, never a mix
+        fd, tmp_path = tempfile.mkstemp(prefix=CURRENT_FILE + '.', dir=path)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(os.path.basename(version_path))
+        os.replace(tmp_path, os.path.join(path, CURRENT_FILE))
+
+        return cls(path, version=os.path.basename(version_path))
+
+    @classmethod
+    def open_or_build(cls, path, fingerprint, build, encode_binary=False, rebuild=False):
+        """Open the store at `path` if it was built with `fingerprint`, else build a new version.
+
+        `build()` must return (df, extra); it only runs when the store is missing,
+        stale or `rebuild` is set. A forced rebuild is skipped if another process
+        published a new version while this one waited for the build lock, so
+        workers started together share one build.
+        """
+        def is_fresh(version):
+            meta = _read_meta(path, version) if version else None
+            return meta is not None and meta.get('format') == FORMAT_VERSION \
+                and meta.get('fingerprint') == fingerprint
+
+        seen = _read_current(path)
+        if not rebuild and is_fresh(seen):
+            try:
+                return cls(path, version=seen)
+            except FileNotFoundError:
+                pass  # pruned by a concurrent rebuild; check again under the lock
+
+        os.makedirs(path, exist_ok=True)
+        with _build_lock(path):
+            current = _read_current(path)
+            if is_fresh(current) and (not rebuild or current != seen):
+                return cls(path, version=current)
+            df, extra = build()
+            store = cls.from_frame(df, path, encode_binary=encode_binary,
+                                   fingerprint=fingerprint, extra=extra)
+            if fcntl is not None:
+                cls._prune(path, keep=store.version)
+        return store
+
+    @staticmethod
+    def _prune(path, keep):
+        # Only called under the build lock, so no other builder is writing a version.
+        # Processes that still map an old version keep working: on POSIX the pages
+        # stay valid after the files are unlinked.
+        for name in os.listdir(path):
+            if name.startswith(VERSION_PREFIX) and name != keep:
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    @staticmethod
+    def exists(path):
+        return os.path.exists(os.path.join(path, CURRENT_FILE))
+
+    @property
+    def shape(self):
+        return (self._floats.shape[0], len(self.columns))
+
+    @property
+    def nbytes(self):
+        return self._floats.nbytes + (self._codes.nbytes if self._codes is not None else 0)
+
+    @property
+    def values(self):
+        """(n_samples, n_features) float32 matrix in `columns` order.
+
+        Zero-copy view of the mapped file when no columns are encoded. With
+        encoded columns a float32 matrix is built on first access and cached.
+        """
+        if self._codes is None:
+            return self._floats
+        if self._values is None:
+            out = np.empty(self.shape, dtype=np.float32)
+            for j, name in enumerate(self.columns):
+                out[:, j] = self.column(name)
+            self._values = out
+        return self._values
+
+    def column(self, name):
+        """Single column as a (strided) view of the mapped data."""
+        block, idx = self._layout[name]
+        if block == 'code':
+            return self._codes[:, idx]
+        return self._floats[:, idx]
+
+    def to_frame(self):
+        """DataFrame wrapping `values` without copying it."""
+        return pd.DataFrame(self.values, columns=self.columns, copy=False)
@@ -0,0 +1,181 @@
+import importlib
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store import FeatureStore
+
+
+def _frame():
+    # Genre_Male in the middle, so encoding it changes the block layout but not the column order
+    return pd.DataFrame({
+        'Age': [-1.0, 0.5, 2.0, 0.25],
+        'Genre_Male': [1.0, 0.0, 1.0, 0.0],
+        'Annual Income (k$)': [0.1, -0.2, 0.3, -0.4],
+    })
+
+
+def _build_in(path):
+    FeatureStore.from_frame(_frame(), path)
+
+
+def _open_or_build_in(path, barrier, queue, rebuild):
+    def build():
+        # Record each build in a file, since the workers are separate processes
+        with open(os.path.join(path, 'builds.log'), 'a') as f:
+            f.write('build\n')
+        time.sleep(0.5)  # keep the build running while the other workers start
+        return _frame(), {}
+
+    barrier.wait()
+    store = FeatureStore.open_or_build(path, 'fp', build, rebuild=rebuild)
+    queue.put(store.version)
+
+
+def _run_workers(path, n, rebuild):
+    barrier = multiprocessing.Barrier(n)
+    queue = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_open_or_build_in, args=(path, barrier, queue, rebuild))
+             for _ in range(n)]
+    for p in procs:
+        p.start()
+    versions = [queue.get(timeout=30) for _ in procs]
+    for p in procs:
+        p.join()
+    assert all(p.exitcode == 0 for p in procs)
+    return versions
+
+
+def _build_count(path):
+    with open(os.path.join(path, 'builds.log')) as f:
+        return len(f.readlines())
+
+
+def _version_dirs(path):
+    return sorted(name for name in os.listdir(path) if name.startswith('v-'))
+
+
+def test_round_trip(tmp_path):
+    df = _frame()
+    FeatureStore.from_frame(df, str(tmp_path))
+    store = FeatureStore(str(tmp_path))
+    assert store.columns == list(df.columns)
+    assert store.shape == df.shape
+    assert store.values.dtype == np.float32
+    np.testing.assert_allclose(store.values, df.to_numpy(), rtol=1e-6)
+
+
+def test_values_is_view_without_encoding(tmp_path):
+    store = FeatureStore.from_frame(_frame(), str(tmp_path))
+    assert isinstance(store.values, np.memmap)
+    assert np.shares_memory(store.values, store.column('Age'))
+    assert np.shares_memory(store.values, store.to_frame().to_numpy())
+
+
+def test_encode_binary_keeps_column_order(tmp_path):
+    df = _frame()
+    store = FeatureStore.from_frame(df, str(tmp_path), encode_binary=True)
+    assert store.columns == list(df.columns)
+    assert store.column('Genre_Male').dtype == np.uint8
+    np.testing.assert_allclose(store.values, df.to_numpy(), rtol=1e-6)
+    # Materialized once and cached
+    assert store.values is store.values
+
+
+def test_encode_binary_rejects_non_binary(tmp_path):
+    df = _frame()
+    df.loc[0, 'Genre_Male'] = 2.0
+    with pytest.raises(ValueError):
+        FeatureStore.from_frame(df, str(tmp_path), encode_binary=True)
+
+
+def test_open_or_build_reuses_matching_fingerprint(tmp_path):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return _frame(), {'note': len(calls)}
+
+    first = FeatureStore.open_or_build(str(tmp_path), 'a', build)
+    second = FeatureStore.open_or_build(str(tmp_path), 'a', build)
+    assert len(calls) == 1
+    assert second.extra == first.extra
+    FeatureStore.open_or_build(str(tmp_path), 'b', build)
+    FeatureStore.open_or_build(str(tmp_path), 'b', build, rebuild=True)
+    assert len(calls) == 3
+
+
+def test_concurrent_from_frame_writers(tmp_path):
+    procs = [multiprocessing.Process(target=_build_in, args=(str(tmp_path),)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert all(p.exitcode == 0 for p in procs)
+    np.testing.assert_allclose(FeatureStore(str(tmp_path)).values, _frame().to_numpy(), rtol=1e-6)
+
+
+def test_concurrent_open_or_build_builds_once(tmp_path):
+    path = str(tmp_path)
+    versions = _run_workers(path, 4, rebuild=False)
+    assert _build_count(path) == 1
+    assert len(set(versions)) == 1
+
+
+def test_concurrent_forced_rebuild_builds_once_and_prunes(tmp_path):
+    path = str(tmp_path)
+    _run_workers(path, 1, rebuild=False)
+    versions = _run_workers(path, 4, rebuild=True)
+    assert _build_count(path) == 2
+    assert len(set(versions)) == 1
+    # Only the published version is left on disk
+    assert _version_dirs(path) == [versions[0]]
+    assert FeatureStore(path).version == versions[0]
+
+
+def test_old_format_store_is_rebuilt(tmp_path, monkeypatch):
+    import feature_store
+
+    path = str(tmp_path)
+    old = FeatureStore.open_or_build(path, 'fp', lambda: (_frame(), {}))
+    monkeypatch.setattr(feature_store, 'FORMAT_VERSION', feature_store.FORMAT_VERSION + 1)
+    new = FeatureStore.open_or_build(path, 'fp', lambda: (_frame(), {}))
+    assert new.version != old.version
+
+
+def test_scaled_columns_change_rebuilds_store(tmp_path, monkeypatch):
+    import data
+
+    path = str(tmp_path)
+    before = data.load_feature_store(path)
+    assert before.extra['scaled_columns'] == data.NUMERICAL_COLS
+
+    scaled = ['Annual Income (k$)', 'Spending Score (1-100)']
+    monkeypatch.setattr(data, 'NUMERICAL_COLS', scaled)
+    after = data.load_feature_store(path)
+    assert after.fingerprint != before.fingerprint
+    assert after.extra['scaled_columns'] == scaled
+    # Age is no longer standardized
+    raw_age = pd.read_csv(data.CSV_PATH)['Age'].to_numpy()
+    np.testing.assert_allclose(after.column('Age'), raw_age)
+
+
+def test_backend_profiles_match_float64_frame(tmp_path, monkeypatch):
+    pytest.importorskip('flask')
+    pytest.importorskip('flask_cors')
+    monkeypatch.setenv('FEATURE_STORE_PATH', str(tmp_path))
+    app = importlib.import_module('backend.app')
+    from data import preprocess_data
+
+    df = preprocess_data()
+    for algorithm in ['dbscan', 'agglomerative', 'divisive']:
+        labels = app.models_labels[algorithm]
+        expected = df.groupby(labels).mean()
+        for cluster_id in np.unique(labels):
+            profile = app.get_cluster_profile(cluster_id, algorithm)
+            for feature in app.feature_names:
+                assert profile['features'][feature] == pytest.approx(expected.loc[cluster_id, feature], abs=1e-4)
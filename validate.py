@@ -38,13 +38,14 @@ def check_backend_dependencies():
 def check_dataset():
     """Check if dataset exists"""
     print("\n📁 Checking dataset...")
-    dataset_path = Path("backend/Mall_Customers.csv")
+    # The backend loads the dataset through data.py, from the repository root
+    dataset_path = Path(__file__).resolve().parent / "Mall_Customers.csv"
     if dataset_path.exists():
         print(f"  ✅ {dataset_path} found")
         return True
     else:
         print(f"  ❌ {dataset_path} not found")
-        print("     Copy Mall_Customers.csv from parent directory to backend/")
+        print("     Place Mall_Customers.csv in the repository root (next to data.py)")
         return False
 
 def check_frontend_setup():